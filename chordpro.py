@@ -107,11 +107,8 @@ def _convert_lines_to_ast_nodes(lines, chords, end_of_section_markers=()):
     elif key == "define":
       name, frets = _parse_chord_definition(value)
       chords[name] = frets
-    elif key in ("title", "subtitle"):
+    elif key in ("title", "subtitle", "fontsize"):
       continue  # Handled earlier.
-    elif key == "fontsize":
-      # TODO: How to handle font size?
-      pass  # Should translate to pdf_writer.setFontsize(int(value))
     elif key in ("eoc", "end-of-chorus", "end_of_chorus"):
       # If not already part of breaking condition.
       raise ChordProError(
@@ -121,11 +118,37 @@ def _convert_lines_to_ast_nodes(lines, chords, end_of_section_markers=()):
   return result
 
 
+def parse_fontsize(value):
+  """Parse a font size in pt, like "12", "12.5" or "12pt".
+
+  Returns None for a missing or empty value.
+  """
+  if value is None or not value.strip():
+    return None
+  number = value.strip()
+  if number.endswith("pt"):
+    number = number[:-2]
+  try:
+    fontsize = float(number)
+  except ValueError:
+    raise ChordProError("Invalid font size: %s", value)
+  if fontsize <= 2:
+    raise ChordProError("Font size too small: %s", value)
+  return fontsize
+
+
 def to_ast(infile):
+  """Parse a ChordPro file into a song.Song.
+
+  Title, subtitle and font size apply to the whole song, wherever they
+  appear; if one of them is given several times, the last one wins.
+  """
   lines = [_chordpro_line(line) for line in infile.readlines()]
   keys_and_values = dict(lines)
   title = keys_and_values.get("title", "").strip()
   subtitle = keys_and_values.get("subtitle", "").strip()
+  fontsize = parse_fontsize(keys_and_values.get("fontsize"))
   chords = {}
   children = _convert_lines_to_ast_nodes(iter(lines), chords=chords)
-  return song.Song(children, title=title, subtitle=subtitle, chords=chords)
+  return song.Song(children, title=title, subtitle=subtitle, chords=chords,
+                   fontsize=fontsize)
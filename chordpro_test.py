@@ -74,6 +74,43 @@ class LineParsingTest(unittest.TestCase):
                      ("C7", "chords.")]))
 
 
+class FontsizeTest(unittest.TestCase):
+
+  def testFontsize(self):
+    self.assertEqual(16, chordpro.parse_fontsize("16"))
+
+  def testFractionalFontsize(self):
+    self.assertEqual(12.5, chordpro.parse_fontsize(" 12.5"))
+
+  def testFontsizeInPoints(self):
+    self.assertEqual(12, chordpro.parse_fontsize("12pt"))
+
+  def testNoFontsize(self):
+    self.assertEqual(None, chordpro.parse_fontsize(None))
+    self.assertEqual(None, chordpro.parse_fontsize(""))
+
+  def testInvalidFontsize(self):
+    self.assertRaises(
+      chordpro.ChordProError, chordpro.parse_fontsize, "huge")
+
+  def testTooSmallFontsize(self):
+    self.assertRaises(
+      chordpro.ChordProError, chordpro.parse_fontsize, "2")
+
+  def testFontsizeDirective(self):
+    song = chordpro.to_ast(io.StringIO(
+        "{title:Big}\n{fontsize: 16}\nSome [C]lyrics.\n"))
+    self.assertEqual(16, song._fontsize)
+
+  def testFractionalFontsizeDirective(self):
+    song = chordpro.to_ast(io.StringIO("{fontsize: 12.5}\nSome lyrics.\n"))
+    self.assertEqual(12.5, song._fontsize)
+
+  def testBareFontsizeDirective(self):
+    song = chordpro.to_ast(io.StringIO("{fontsize}\nSome lyrics.\n"))
+    self.assertEqual(None, song._fontsize)
+
+
 class SimpleConversionTest(unittest.TestCase):
   def assertGeneratesText(self, infile, expected_outfile):
     with open(expected_outfile, "r", encoding="utf-8") as expected_outfile:
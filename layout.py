@@ -0,0 +1,362 @@
+"""Lay out songs as positioned boxes, independent of the drawing backend.
+
+The LayoutWriter implements the same writer interface as TextWriter
+(setTitle, startLyrics, addLine, ...), so a song.Song is laid out with
+song.write_out(LayoutWriter(style)).  The result is a Layout: boxes with
+absolute page coordinates, which a backend like pdfwriter only has to paint.
+
+Layouts do not refer to any canvas, so they are cheap to compute, can be
+cached and can be painted by several backends.
+"""
+
+import collections
+import contextlib
+import math
+
+from reportlab.lib import colors
+from reportlab.lib import pagesizes
+from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfmetrics
+
+import uke
+
+
+# For clarity; ReportLab measures things in pt already.
+pt = 1
+
+# ReportLab's default leading for a font size.
+_LEADING = 1.2
+
+# Rounding slack when checking whether boxes stay within the margins.
+_EPSILON = 0.01*pt
+
+# Colors in boxes are plain (red, green, blue) tuples with components
+# from 0 to 1, so that backends don't need to know ReportLab's types.
+BLACK = colors.black.rgb()
+WHITE = colors.white.rgb()
+GRAY = colors.Color(0.5, 0.5, 0.5).rgb()
+SKYBLUE = colors.skyblue.rgb()
+
+
+# A run of text, with its baseline starting at (x, y).
+TextRun = collections.namedtuple(
+    "TextRun", "x y width text font size color")
+
+# A chord name placed above the lyrics.
+ChordLabel = collections.namedtuple(
+    "ChordLabel", "x y width text font size color")
+
+# A filled rectangle (chorus bars, comment backgrounds, title rule).
+Bar = collections.namedtuple(
+    "Bar", "x y width height color")
+
+# A chord diagram; (x, y) is the top left corner, width and height
+# are the size of the fret grid, font and size are for the chord name.
+Diagram = collections.namedtuple(
+    "Diagram", "x y width height name frets font size")
+
+
+class StyleSheet(collections.namedtuple("StyleSheet", (
+    "pagesize",
+    "top_margin", "bottom_margin", "left_margin", "right_margin",
+    "fontsize",
+    "lyrics_font", "chorus_font", "chord_font", "comment_font",
+    "title_font", "title_fontsize",
+    "subtitle_font", "subtitle_fontsize",
+    "diagram_font", "diagram_fontsize"))):
+  """Page size, margins and fonts used for laying out a song.
+
+  Style sheets are immutable; use replace() to derive a modified one.
+  The fontsize is the lyrics font size; chords and comments follow it.
+  Titles and chord diagrams have fixed sizes.
+  """
+  __slots__ = ()
+
+  def replace(self, **kwargs):
+    return self._replace(**kwargs)
+
+  @property
+  def chord_fontsize(self):
+    return self.fontsize - 2
+
+  @property
+  def comment_fontsize(self):
+    return self.fontsize
+
+
+StyleSheet.__new__.__defaults__ = (
+    pagesizes.A4,
+    1.5*cm, 1.5*cm, 2*cm, 2*cm,
+    14,
+    "Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-Bold",
+    "Helvetica-Bold", 20,
+    "Helvetica-Oblique", 14,
+    "Helvetica", 12)
+
+
+class Layout(object):
+  """The positioned boxes of a song, in painting order."""
+
+  def __init__(self, style, boxes):
+    self.style = style
+    self.boxes = tuple(boxes)
+
+  @property
+  def pagesize(self):
+    return self.style.pagesize
+
+  @property
+  def bottom(self):
+    """The lowest y coordinate used by any box."""
+    return _bottom(self.boxes, self.style)
+
+  @property
+  def right(self):
+    """The highest x coordinate used by any box."""
+    return _right(self.boxes, self.style)
+
+  def fits_on_page(self):
+    return self._fits(self.boxes)
+
+  def lyrics_fit_on_page(self):
+    """Whether everything but the chord diagrams fits on the page.
+
+    Chord diagrams have a fixed size, so unlike the rest this doesn't
+    depend on the font size.
+    """
+    return self._fits(
+        [box for box in self.boxes if not isinstance(box, Diagram)])
+
+  def _fits(self, boxes):
+    width = self.style.pagesize[0]
+    return (_bottom(boxes, self.style) >= self.style.bottom_margin - _EPSILON
+            and _right(boxes, self.style) <=
+            width - self.style.right_margin + _EPSILON)
+
+  def __repr__(self):
+    return "<Layout: %d boxes, fontsize %s>" % (
+        len(self.boxes), self.style.fontsize)
+
+
+def _bottom(boxes, style):
+  return min([_box_bottom(box) for box in boxes] or [style.pagesize[1]])
+
+
+def _right(boxes, style):
+  return max([box.x + box.width for box in boxes] or [style.left_margin])
+
+
+def _box_bottom(box):
+  if isinstance(box, Diagram):
+    # The name above the grid and the four fret rows of the grid.
+    return box.y - 1.5*box.height
+  return box.y
+
+
+class LayoutWriter(object):
+  """Lays out songs, using the writer interface of song.Song.write_out()."""
+
+  def __init__(self, style=None, fontsize=None):
+    """Create a layout writer.
+
+    Args:
+      style: The StyleSheet to use (default: StyleSheet()).
+      fontsize: If given, overrides both the style sheet font size
+        and {fontsize} directives in the song.
+    """
+    style = style or StyleSheet()
+    if fontsize is not None:
+      style = style.replace(fontsize=fontsize)
+    self._style = style
+    self._fixed_fontsize = fontsize is not None
+
+    width, height = style.pagesize
+    self._leftmargin = style.left_margin
+    self._rightmargin = width - style.right_margin
+    self._topmargin = height - style.top_margin
+
+    # Text cursor: x is the start of the current line, y the baseline.
+    self._x = self._leftmargin
+    self._y = self._topmargin
+    self._leading = _LEADING * style.fontsize
+    self._font = style.lyrics_font
+    self._lyricstop = self._topmargin
+
+    self._boxes = []
+    self._layout = None
+
+    # Keep track of the chords seen already, in order of appearance.
+    self._seen_chords = []
+    self._seen_chords_set = set()
+
+    # Was there a text on the last line?  (For spacing)
+    self._text_on_last_line = False
+    self._chords = dict(uke.CHORDS)
+
+  @property
+  def layout(self):
+    """The finished Layout, available after finish()."""
+    return self._layout
+
+  def _textLine(self):
+    self._y -= self._leading
+
+  def _addText(self, box_type, x, y, text, font, size, color):
+    """Add a TextRun or ChordLabel box and return its width."""
+    width = pdfmetrics.stringWidth(text, font, size)
+    self._boxes.append(box_type(x, y, width, text, font, size, color))
+    return width
+
+  def setFontsize(self, size):
+    if not self._fixed_fontsize:
+      self._style = self._style.replace(fontsize=size)
+      self._leading = _LEADING * size
+
+  def setTitle(self, title, subtitle):
+    style = self._style
+    self._y = self._topmargin - style.title_fontsize*pt
+    if title:
+      self._addText(TextRun, self._x, self._y, title,
+                    style.title_font, style.title_fontsize, BLACK)
+    self._leading = _LEADING * style.subtitle_fontsize
+    self._textLine()
+    if subtitle:
+      self._addText(TextRun, self._x, self._y, subtitle,
+                    style.subtitle_font, style.subtitle_fontsize, GRAY)
+    self._textLine()
+    self._boxes.append(Bar(
+        self._x, self._y, self._rightmargin - self._x, 7*pt, SKYBLUE))
+    self._textLine()
+    self._text_on_last_line = False
+
+  def startLyrics(self):
+    self._lyricstop = self._y
+    self._font = self._style.lyrics_font
+    self._leading = _LEADING * self._style.fontsize
+    self._textLine()
+    self._text_on_last_line = False
+
+  @contextlib.contextmanager
+  def chorusSection(self):
+    fontsize = self._style.fontsize
+    indent = fontsize
+    oldx, oldy = self._x, self._y
+    self._x = oldx + indent
+    self._font = self._style.chorus_font
+    yield
+    newy = self._y
+    self._x = oldx
+    self._font = self._style.lyrics_font
+    self._boxes.append(Bar(
+        oldx, newy + fontsize - 3, indent/2.0, oldy - newy, SKYBLUE))
+
+  def chordAbove(self, pos, chord):
+    if not chord:
+      return
+
+    if chord not in self._seen_chords_set:
+      self._seen_chords_set.add(chord)
+      self._seen_chords.append(chord)
+    x, y = pos
+    self._addText(ChordLabel, x, y + self._style.fontsize, chord,
+                  self._style.chord_font, self._style.chord_fontsize, BLACK)
+
+  def addComment(self, comment):
+    margin_bottom = 5
+    margin_top = 0
+    style = self._style
+    text = ' ' + comment + ' '
+    width = pdfmetrics.stringWidth(
+        text, style.comment_font, style.comment_fontsize)
+    self._boxes.append(Bar(
+        self._x, self._y - margin_bottom, width,
+        style.fontsize + margin_bottom + margin_top, BLACK))
+    self._boxes.append(TextRun(
+        self._x, self._y, width, text,
+        style.comment_font, style.comment_fontsize, WHITE))
+    self._textLine()
+    self._text_on_last_line = True
+
+  def addLine(self, segments):
+    """Add a lyrics line with the given text segments.
+
+    Args:
+      segments: A list of (chord, text) tuples.
+    """
+    has_text = any(text for unused_chord, text in segments)
+    if not has_text:
+      if self._text_on_last_line:
+        self._textLine()
+        self._text_on_last_line = False
+      return
+
+    if any(chord for chord, unused_text in segments):
+      self._textLine()  # Make space for chords.
+
+    fontsize = self._style.fontsize
+    x = self._x
+    for chord, text in segments:
+      width = 0
+      if text:
+        width = self._addText(
+            TextRun, x, self._y, text, self._font, fontsize, BLACK)
+      self.chordAbove((x, self._y), chord)
+      x += width
+    self._textLine()
+    self._text_on_last_line = True
+
+  def finish(self):
+    width, height = 0.8*cm, 1*cm
+    x = self._rightmargin - 1*cm - 0.15*cm
+    y = self._lyricstop - 0.48*cm
+    for chordname in self._seen_chords:
+      self._boxes.append(Diagram(
+          x, y, width, height, chordname, self._chords[chordname],
+          self._style.diagram_font, self._style.diagram_fontsize))
+      y -= 2*height
+    self._layout = Layout(self._style, self._boxes)
+
+
+def layout_song(song, style=None, fontsize=None):
+  """Lay out a song.Song.
+
+  Args:
+    song: The song.Song to lay out.
+    style: The StyleSheet to use (default: StyleSheet()).
+    fontsize: If given, overrides the style sheet and {fontsize} directives.
+
+  Returns:
+    A Layout.
+  """
+  writer = LayoutWriter(style, fontsize=fontsize)
+  song.write_out(writer)
+  return writer.layout
+
+
+def autofit(song, style=None, fontsize=None, min_fontsize=6):
+  """Lay out a song with the biggest font size that fits on one page.
+
+  Starts from the font size layout_song() would use and binary searches
+  over smaller integer sizes.  Only the layout pass runs for each probe,
+  nothing gets drawn.  Chord diagrams don't shrink with the font, so
+  only the other boxes are fitted (see Layout.lyrics_fit_on_page()).
+
+  Returns:
+    A Layout.  If the song doesn't fit even at min_fontsize, or the
+    starting size is already at most min_fontsize, the starting layout.
+  """
+  start = layout_song(song, style, fontsize=fontsize)
+  if start.lyrics_fit_on_page() or start.style.fontsize <= min_fontsize:
+    return start
+
+  lo, hi = min_fontsize, int(math.ceil(start.style.fontsize)) - 1
+  best = None
+  while lo <= hi:
+    mid = (lo + hi) // 2
+    candidate = layout_song(song, style, fontsize=mid)
+    if candidate.lyrics_fit_on_page():
+      best = candidate
+      lo = mid + 1
+    else:
+      hi = mid - 1
+  return best or start
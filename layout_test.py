@@ -0,0 +1,132 @@
+import io
+import unittest
+
+import layout
+import pdfwriter
+import song as song_ast
+import uke
+
+
+def _make_song(verses=1, fontsize=None):
+  line = song_ast.Line([(None, "Hello, "), ("Bb", "world!")])
+  return song_ast.Song(
+      title="Hello, world",
+      subtitle="One of the great timeless classics",
+      children=[song_ast.Verse([line, line, line, line])
+                for unused_i in range(verses)],
+      fontsize=fontsize)
+
+
+class LayoutTest(unittest.TestCase):
+
+  def test_boxes(self):
+    song_layout = layout.layout_song(_make_song())
+    texts = [box.text for box in song_layout.boxes
+             if isinstance(box, layout.TextRun)]
+    self.assertEqual(
+        ["Hello, world", "One of the great timeless classics"] +
+        ["Hello, ", "world!"] * 4,
+        texts)
+    chords = [box for box in song_layout.boxes
+              if isinstance(box, layout.ChordLabel)]
+    self.assertEqual(4, len(chords))
+    self.assertEqual(12, chords[0].size)
+    diagrams = [box for box in song_layout.boxes
+                if isinstance(box, layout.Diagram)]
+    self.assertEqual(["Bb"], [diagram.name for diagram in diagrams])
+
+  def test_fontsize_directive(self):
+    song_layout = layout.layout_song(_make_song(fontsize=20))
+    self.assertEqual(20, song_layout.style.fontsize)
+
+  def test_fontsize_override(self):
+    song_layout = layout.layout_song(_make_song(fontsize=20), fontsize=10)
+    self.assertEqual(10, song_layout.style.fontsize)
+
+  def test_pagesize(self):
+    style = layout.StyleSheet(pagesize=(300, 400))
+    song_layout = layout.layout_song(_make_song(), style)
+    self.assertEqual((300, 400), song_layout.pagesize)
+    self.assertTrue(all(box.y < 400 for box in song_layout.boxes))
+
+  def test_autofit_keeps_fitting_layout(self):
+    song_layout = layout.autofit(_make_song())
+    self.assertEqual(14, song_layout.style.fontsize)
+    self.assertTrue(song_layout.fits_on_page())
+
+  def test_autofit_shrinks(self):
+    song = _make_song(verses=8)
+    self.assertFalse(layout.layout_song(song).fits_on_page())
+    song_layout = layout.autofit(song)
+    self.assertTrue(song_layout.fits_on_page())
+    self.assertLess(song_layout.style.fontsize, 14)
+    bigger = layout.layout_song(
+        song, fontsize=song_layout.style.fontsize + 1)
+    self.assertFalse(bigger.fits_on_page())
+
+  def test_autofit_never_grows_font(self):
+    song = _make_song(verses=8)
+    song_layout = layout.autofit(song, fontsize=4)
+    self.assertEqual(4, song_layout.style.fontsize)
+
+  def test_autofit_starting_size_if_nothing_fits(self):
+    song = _make_song(verses=100)
+    song_layout = layout.autofit(song, min_fontsize=6)
+    self.assertEqual(14, song_layout.style.fontsize)
+    self.assertFalse(song_layout.fits_on_page())
+
+  def test_autofit_ignores_chord_diagrams(self):
+    # The diagrams for all known chords don't fit on the page,
+    # at any font size.
+    song = song_ast.Song(children=[song_ast.Verse([song_ast.Line(
+        [(chord, "la ") for chord in sorted(uke.CHORDS)])])])
+    self.assertFalse(layout.layout_song(song).fits_on_page())
+    song_layout = layout.autofit(song)
+    self.assertEqual(14, song_layout.style.fontsize)
+    self.assertTrue(song_layout.lyrics_fit_on_page())
+
+  def test_autofit_shrinks_lyrics_next_to_many_chords(self):
+    line = song_ast.Line([(chord, "la ") for chord in sorted(uke.CHORDS)])
+    song = song_ast.Song(
+        children=[song_ast.Verse([line] * 4) for unused_i in range(8)])
+    self.assertFalse(layout.layout_song(song).lyrics_fit_on_page())
+    song_layout = layout.autofit(song)
+    self.assertLess(song_layout.style.fontsize, 14)
+    self.assertTrue(song_layout.lyrics_fit_on_page())
+
+  def test_diagram_font(self):
+    style = layout.StyleSheet(diagram_font="Times-Roman", diagram_fontsize=9)
+    song_layout = layout.layout_song(_make_song(), style)
+    diagrams = [box for box in song_layout.boxes
+                if isinstance(box, layout.Diagram)]
+    self.assertEqual([("Times-Roman", 9)],
+                     [(diagram.font, diagram.size) for diagram in diagrams])
+
+  def test_wide_line_does_not_fit(self):
+    song = song_ast.Song(
+        children=[song_ast.Verse([song_ast.Line([("C", "word ")] * 200)])])
+    song_layout = layout.layout_song(song)
+    self.assertGreater(song_layout.right, song_layout.pagesize[0])
+    self.assertFalse(song_layout.fits_on_page())
+
+  def test_boxes_use_plain_colors(self):
+    for box in layout.layout_song(_make_song()).boxes:
+      if hasattr(box, "color"):
+        self.assertIsInstance(box.color, tuple)
+
+  def test_render_pdf(self):
+    outfile = io.BytesIO()
+    pdfwriter.render(layout.layout_song(_make_song()), outfile)
+    self.assertTrue(outfile.getvalue().startswith(b"%PDF"))
+
+  def test_pdfwriter_matches_render(self):
+    song = _make_song()
+    rendered = io.BytesIO()
+    pdfwriter.render(layout.layout_song(song), rendered)
+    written = io.BytesIO()
+    song.write_out(pdfwriter.PdfWriter(written))
+    self.assertEqual(rendered.getvalue(), written.getvalue())
+
+
+if __name__ == "__main__":
+  unittest.main()
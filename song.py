@@ -58,16 +58,20 @@ class Chorus(ContainerNode):
 
 
 class Song(object):
-  def __init__(self, children, title='', subtitle='', chords={}):
+  def __init__(self, children, title='', subtitle='', chords={},
+               fontsize=None):
     self._children = children
     self._title = title
     self._subtitle = subtitle
     self._chords = chords
+    self._fontsize = fontsize
 
   def write_out(self, pdf_writer):
     for name, frets in self._chords.items():
       pdf_writer._chords[name] = frets
 
+    if self._fontsize:
+      pdf_writer.setFontsize(self._fontsize)
     pdf_writer.setTitle(self._title, self._subtitle)
     pdf_writer.startLyrics()
     for child in self._children:
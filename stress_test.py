@@ -0,0 +1,205 @@
+"""Memory and time regression tests for very large inputs.
+
+The inputs are generated on the fly and run through chordpro.to_ast, the
+layout pass and both writers.  We check peak memory (measured with
+tracemalloc) against a budget per input item, and that run time doesn't
+grow clearly worse than linear with the input size.
+
+These tests are slow, so they only run when UKECHORD_STRESS_SCALE is set.
+It scales the input sizes: 1 gives the full sizes (e.g. 200k lines),
+0.05 a quicker run.
+"""
+
+import gc
+import io
+import os
+import time
+import tracemalloc
+import unittest
+
+import chordpro
+import layout
+import pdfwriter
+import textwriter
+
+
+_SCALE = float(os.environ.get("UKECHORD_STRESS_SCALE", "0"))
+_SKIP_REASON = "set UKECHORD_STRESS_SCALE to run the stress tests"
+
+KiB = 1024
+
+# Growing the input by this factor...
+_GROWTH = 8
+# ...may grow the run time by at most this factor (quadratic would be 64).
+_MAX_TIME_GROWTH = 16
+# Shorter run times are too noisy to compare.
+_MIN_TIME = 0.01
+
+# Memory that doesn't depend on the input size (fonts, PDF boilerplate).
+_BASE_MEMORY = 512*KiB
+
+
+def _many_lines(n):
+  """A song with n lyrics lines, chords on every line."""
+  chords = ("C", "Dm", "G7", "Am", "F", "Bb")
+  return "\n".join(
+      ["{title:Many lines}"] +
+      ["%s [%s]line [%s]number %d" % (
+          "" if i % 8 else "\n", chords[i % 6], chords[(i + 1) % 6], i)
+       for i in range(n)])
+
+
+def _many_chords(n):
+  """A song with a single line with n distinct chords."""
+  return "\n".join(
+      ["{title:Many chords}"] +
+      ["{define: X%d frets 0 1 2 3 fingers 1 2 3 4}" % i for i in range(n)] +
+      ["".join("[X%d]la " % i for i in range(n))])
+
+
+def _huge_comment_block(n):
+  """A song with a block of n long comment lines."""
+  return "\n".join(
+      ["{title:Many comments}"] +
+      ["{comment:%s}" % ("This is comment %d. " % i * 5) for i in range(n)])
+
+
+def _parse(data):
+  return chordpro.to_ast(io.StringIO(data))
+
+
+def _layout(data):
+  layout.layout_song(_parse(data))
+
+
+def _write_text(data):
+  _parse(data).write_out(textwriter.TextWriter(io.StringIO()))
+
+
+def _write_pdf(data):
+  _parse(data).write_out(pdfwriter.PdfWriter(io.BytesIO()))
+
+
+def _peak_memory(func, data):
+  gc.collect()
+  tracemalloc.start()
+  try:
+    func(data)
+    return tracemalloc.get_traced_memory()[1]
+  finally:
+    tracemalloc.stop()
+
+
+def _run_time(func, data, repeat=3):
+  """The best of several run times, with garbage collection disabled."""
+  times = []
+  gc.collect()
+  gc.disable()
+  try:
+    for unused_i in range(repeat):
+      start = time.perf_counter()
+      func(data)
+      times.append(time.perf_counter() - start)
+  finally:
+    gc.enable()
+  return min(times)
+
+
+class _StressTest(object):
+  """Checks for one kind of generated input.
+
+  Subclasses set generate(n), the full input size and the memory budgets
+  in bytes per input item for parsing, layout, text and PDF output.
+  The budgets are about 1.5 times the measured peaks.
+  """
+  generate = None
+  full_size = None
+  # Minimum input size for the layout time check.
+  layout_time_size = 0
+  parse_memory = None
+  layout_memory = None
+  text_memory = None
+  pdf_memory = None
+
+  @property
+  def size(self):
+    return max(int(self.full_size * _SCALE), 100)
+
+  def assertMemoryBelow(self, func, budget_per_item):
+    peak = _peak_memory(func, type(self).generate(self.size))
+    budget = _BASE_MEMORY + budget_per_item * self.size
+    self.assertLessEqual(
+        peak, budget, "Peak memory %d KiB, budget %d KiB for size %d" % (
+            peak // KiB, budget // KiB, self.size))
+
+  def assertLinearTime(self, func, size=None):
+    size = size or self.size
+    small = type(self).generate(size // _GROWTH)
+    large = type(self).generate(size)
+    small_time = _run_time(func, small)
+    large_time = _run_time(func, large)
+    self.assertLessEqual(
+        large_time, _MAX_TIME_GROWTH * max(small_time, _MIN_TIME),
+        "Run time %.3fs for size %d, %.3fs for size %d" % (
+            small_time, size // _GROWTH, large_time, size))
+
+  def testParseMemory(self):
+    self.assertMemoryBelow(_parse, self.parse_memory)
+
+  def testLayoutMemory(self):
+    self.assertMemoryBelow(_layout, self.layout_memory)
+
+  def testTextWriterMemory(self):
+    self.assertMemoryBelow(_write_text, self.text_memory)
+
+  def testPdfWriterMemory(self):
+    self.assertMemoryBelow(_write_pdf, self.pdf_memory)
+
+  def testParseTime(self):
+    self.assertLinearTime(_parse)
+
+  def testLayoutTime(self):
+    self.assertLinearTime(
+        _layout, size=max(self.size, self.layout_time_size))
+
+  def testTextWriterTime(self):
+    self.assertLinearTime(_write_text)
+
+  def testPdfWriterTime(self):
+    self.assertLinearTime(_write_pdf)
+
+
+@unittest.skipUnless(_SCALE, _SKIP_REASON)
+class ManyLinesTest(_StressTest, unittest.TestCase):
+  generate = staticmethod(_many_lines)
+  full_size = 200000
+  parse_memory = 1000
+  layout_memory = 1800
+  text_memory = 1000
+  pdf_memory = 4500
+
+
+@unittest.skipUnless(_SCALE, _SKIP_REASON)
+class ManyChordsTest(_StressTest, unittest.TestCase):
+  generate = staticmethod(_many_chords)
+  full_size = 20000
+  # Big enough to show quadratic chord bookkeeping in the layout pass.
+  layout_time_size = 8000
+  parse_memory = 1350
+  layout_memory = 1450
+  text_memory = 1350
+  pdf_memory = 12600
+
+
+@unittest.skipUnless(_SCALE, _SKIP_REASON)
+class HugeCommentBlockTest(_StressTest, unittest.TestCase):
+  generate = staticmethod(_huge_comment_block)
+  full_size = 50000
+  parse_memory = 1450
+  layout_memory = 1450
+  text_memory = 1450
+  pdf_memory = 2700
+
+
+if __name__ == "__main__":
+  unittest.main()
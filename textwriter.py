@@ -19,6 +19,9 @@ class TextWriter(object):
   def addComment(self, comment):
     self._print("// %s" % comment)
 
+  def setFontsize(self, size):
+    pass
+
   def setTitle(self, title, subtitle):
     if title:
       self._print(title)
@@ -36,4 +39,4 @@ class TextWriter(object):
 
   def finish(self):
     if self._chords:
-      self._print("Chords: %s" % ", ".join(self._chords.iterkeys()))
+      self._print("Chords: %s" % ", ".join(self._chords))
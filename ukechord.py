@@ -10,9 +10,26 @@ import sys
 from reportlab.lib import pagesizes
 
 import chordpro
+import layout
 import pdfwriter
 
 
+_PAGESIZES = {
+    "a4": pagesizes.A4,
+    "a5": pagesizes.A5,
+    "letter": pagesizes.letter,
+    "legal": pagesizes.legal,
+}
+
+
+def _fontsize(value):
+  """Parse a font size, with the same checks as the {fontsize} directive."""
+  try:
+    return chordpro.parse_fontsize(value)
+  except chordpro.ChordProError:
+    raise argparse.ArgumentTypeError("invalid font size: %s" % value)
+
+
 def _parse_options(args):
   """Return (options, args)."""
   parser = argparse.ArgumentParser(
@@ -25,6 +42,12 @@ def _parse_options(args):
   parser.add_argument("infile", nargs="?", default=sys.stdin,
                       type=argparse.FileType('r'),
                       help="input filenames (default: stdin)")
+  parser.add_argument("--pagesize", choices=sorted(_PAGESIZES),
+                      default="a4", help="set page size (default: a4)")
+  parser.add_argument("--fontsize", type=_fontsize, default=None,
+                      help="set lyrics font size, overriding {fontsize}")
+  parser.add_argument("--autofit", action="store_true",
+                      help="shrink the font size to fit on one page")
   return parser.parse_args(args)
 
 
@@ -38,8 +61,14 @@ def main(args):
       outfile = getattr(outfile, 'buffer', outfile)
 
     with args.infile as infile:
-      pdf_writer = pdfwriter.PdfWriter(outfile, pagesizes.A4)
-      chordpro.to_ast(infile).write_out(pdf_writer)
+      song = chordpro.to_ast(infile)
+
+    style = layout.StyleSheet(pagesize=_PAGESIZES[args.pagesize])
+    if args.autofit:
+      song_layout = layout.autofit(song, style, fontsize=args.fontsize)
+    else:
+      song_layout = layout.layout_song(song, style, fontsize=args.fontsize)
+    pdfwriter.render(song_layout, outfile)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,44 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import ukechord
+
+
+class CommandLineTest(unittest.TestCase):
+
+  def setUp(self):
+    self.tmpdir = tempfile.mkdtemp()
+    self.outfile = os.path.join(self.tmpdir, "out.pdf")
+
+  def tearDown(self):
+    shutil.rmtree(self.tmpdir)
+
+  def assertWritesPdf(self, args):
+    ukechord.main(["-o", self.outfile] + args + ["examples/test1.chd"])
+    with open(self.outfile, "rb") as outfile:
+      self.assertTrue(outfile.read().startswith(b"%PDF"))
+
+  def test_default_options(self):
+    self.assertWritesPdf([])
+
+  def test_layout_options(self):
+    self.assertWritesPdf(["--pagesize", "letter", "--fontsize", "12.5"])
+
+  def test_autofit(self):
+    self.assertWritesPdf(["--autofit", "--pagesize", "a5"])
+
+  def test_invalid_fontsize(self):
+    for fontsize in ("0", "-3", "huge"):
+      with contextlib.redirect_stderr(io.StringIO()):
+        with self.assertRaises(SystemExit) as context:
+          ukechord.main(["-o", self.outfile, "--fontsize", fontsize,
+                         "examples/test1.chd"])
+      self.assertEqual(2, context.exception.code)
+
+
+if __name__ == "__main__":
+  unittest.main()